@@ -1,18 +1,38 @@
 import requests
 import datetime
-import base64
+import gzip
+import hashlib
+import heapq
+import json
+import operator
 import re
+import ssl
 import time
 import os
+import random
 import sys
 import logging
+from logging.handlers import MemoryHandler
+import threading
 from typing import List, Set, Optional, Dict, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from colorama import Fore, init
-from tabulate import tabulate
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 
-# 初始化 colorama
-init(autoreset=True)
+# 只在交互终端中加载并初始化 colorama；CI 等非 TTY 环境下颜色码只是噪音，
+# 也省去 colorama 对每次 stdout 写入的包装处理
+if sys.stdout.isatty():
+    from colorama import Fore, init
+
+    init(autoreset=True)
+else:
+
+    class _NoColor:
+        """非 TTY 环境下的 Fore 替身，任意颜色属性都是空字符串"""
+
+        def __getattr__(self, name: str) -> str:
+            return ""
+
+    Fore = _NoColor()
 
 # ==================== 配置区域 ====================
 # 建议通过环境变量或配置文件管理这些敏感信息
@@ -21,7 +41,9 @@ init(autoreset=True)
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")  # 必须通过环境变量提供，无默认值
 REPO_OWNER = os.getenv("REPO_OWNER", "BoxMiao007")
 REPO_NAME = os.getenv("REPO_NAME", "Tracker-List")
+BRANCH_NAME = "main"
 TRACKERS_FILE_PATH = "trackers.txt"
+BEST_TRACKERS_FILE_PATH = "trackers_best.txt"
 README_FILE_PATH = "README.md"
 
 # 数据源 URLs
@@ -38,28 +60,193 @@ URLS = [
 
 # 请求配置
 REQUEST_TIMEOUT = 10  # 秒
-MAX_WORKERS = 4  # 并发线程数
+FETCH_MAX_WORKERS = 32  # 数据源获取的并发上限，实际线程数按 URL 数量自适应
+EARLY_STOP_TRACKERS = 0  # 去重后 trackers 达到该数量即不再等待剩余数据源，0 表示关闭
+EARLY_STOP_MIN_SOURCES = 4  # 提前停止前至少需要成功的数据源数量
+FETCH_SOFT_DEADLINE = 0  # 秒，超过该时间且 trackers 已达 MIN_TRACKERS 的两倍时不再等待剩余数据源，0 表示关闭
+MIN_TRACKERS = 50  # 安全检查：trackers 少于该数量时终止提交
 RETRY_TIMES = 3  # 重试次数
-RETRY_DELAY = 2  # 重试间隔（秒）
+RETRY_DELAY = 2  # 重试间隔（秒），实际按指数退避并加随机抖动
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)  # 视为临时故障、值得重试的状态码
+GITHUB_RETRY_TIMES = 5  # GitHub API 重试次数（含限流等待）
+RATE_LIMIT_MAX_WAIT = 300  # GitHub API 单次限流等待上限（秒）
+
+# 缓存配置（数据源条件请求：ETag / Last-Modified）
+CACHE_DIR = ".cache"
+CACHE_INDEX_PATH = os.path.join(CACHE_DIR, "cache.json")
+# 上次提交的文件 blob SHA，按 "owner/repo@branch:path" 记录
+LAST_SHAS_PATH = os.path.join(CACHE_DIR, "last_shas.json")
 
 # 日志配置
+# 文件日志经 MemoryHandler 缓冲，攒满 128 条或遇到 ERROR 时批量写入，退出时由 logging.shutdown 刷新
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+_file_handler = logging.FileHandler("tracker_update.log", encoding="utf-8")
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
+    format=LOG_FORMAT,
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler("tracker_update.log", encoding="utf-8"),
+        MemoryHandler(capacity=128, target=_file_handler),
     ],
 )
 logger = logging.getLogger(__name__)
 
 
+class SharedTLSAdapter(HTTPAdapter):
+    """
+    默认校验（verify=True）的 HTTPS 连接共用一个已加载 CA 证书的 SSLContext
+
+    默认情况下 urllib3 每建立一个新连接都会新建 SSLContext 并重新解析 CA 证书包
+    （约 20ms），共享上下文后只在启动时解析一次。verify 为自定义证书路径
+    （如 REQUESTS_CA_BUNDLE）或 False 时不使用共享上下文，仍由 urllib3 按连接池
+    单独创建，避免自定义证书被加载进共享上下文后影响其他请求。
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._ssl_context = ssl.create_default_context(cafile=requests.certs.where())
+        self._ssl_context.set_alpn_protocols(["http/1.1"])
+        super().__init__(*args, **kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify, cert=None):
+        host_params, pool_kwargs = super().build_connection_pool_key_attributes(
+            request, verify, cert
+        )
+        if verify is True:
+            # ssl_context 是连接池键的一部分，与自定义证书的连接池互不复用
+            pool_kwargs["ssl_context"] = self._ssl_context
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        if verify is True and url.lower().startswith("https"):
+            # CA 证书已在共享上下文中，不再让 urllib3 每个连接重复加载
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+# 共享 HTTP 会话：连接池复用 TCP + TLS 连接
+# SESSION 用于数据源镜像和 HTTP tracker 检测（数据源大多在 raw.githubusercontent.com）
+SESSION = requests.Session()
+_adapter = SharedTLSAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+SESSION.headers.update({"User-Agent": "tracker-updater"})
+
+# GITHUB_SESSION 预置认证头，SHA 查询、tree/commit 创建和 ref 更新复用同一条 api.github.com 连接
+GITHUB_SESSION = requests.Session()
+GITHUB_SESSION.mount(
+    "https://", SharedTLSAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+)
+GITHUB_SESSION.headers.update(
+    {
+        "User-Agent": "tracker-updater",
+        "Authorization": f"token {GITHUB_TOKEN}",
+        "Accept": "application/vnd.github.v3+json",
+    }
+)
+
+# README 更新用的正则（模块加载时编译一次），日期徽章和数量合并为一次扫描
+_README_RE = re.compile(
+    r"(?P<date>\[!\[Last update\]\(https://img.shields.io/badge/Last%20update-\d{4}/\d{2}/\d{2}-%232ea043\?style=flat-square&logo=github\)\]\(#\))"
+    r"|(?P<count>All Tracker list &emsp; \(\d+ trackers\))"
+)
+
+
+# ==================== 缓存模块 ====================
+_cache_lock = threading.Lock()
+_cache_index: Optional[Dict[str, Dict[str, str]]] = None
+
+
+def _cache_body_path(url: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".txt.gz")
+
+
+def _atomic_write(path: str, data: bytes):
+    """先写临时文件再替换，避免中断时留下半个文件"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _load_cache_index() -> Dict[str, Dict[str, str]]:
+    global _cache_index
+    if _cache_index is None:
+        try:
+            with open(CACHE_INDEX_PATH, encoding="utf-8") as f:
+                _cache_index = json.load(f)
+        except (OSError, ValueError):
+            _cache_index = {}
+    return _cache_index
+
+
+def get_cached_response(
+    url: str,
+) -> Tuple[Optional[Dict[str, str]], Optional[bytes]]:
+    """
+    读取 URL 的缓存条目及响应体
+
+    Returns:
+        Tuple[缓存条目, 响应体]，缓存缺失或损坏时均为 None
+    """
+    with _cache_lock:
+        entry = _load_cache_index().get(url)
+    if not entry:
+        return None, None
+    try:
+        with gzip.open(_cache_body_path(url), "rb") as f:
+            body = f.read()
+    except OSError:
+        return None, None
+    if hashlib.sha256(body).hexdigest() != entry.get("body_sha256"):
+        logger.warning("缓存校验失败，忽略缓存: %s", url)
+        return None, None
+    return entry, body
+
+
+def store_cached_response(url: str, response: requests.Response):
+    """保存带有 ETag / Last-Modified 的响应，供下次条件请求使用"""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        # 上游不再提供校验头时移除旧条目及其缓存内容，避免下次带着过期的 ETag 请求
+        with _cache_lock:
+            index = _load_cache_index()
+            if index.pop(url, None) is not None:
+                try:
+                    _atomic_write(
+                        CACHE_INDEX_PATH, json.dumps(index, indent=2).encode("utf-8")
+                    )
+                    os.remove(_cache_body_path(url))
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning("写入缓存失败: %s - %s", url, e)
+        return
+    body = response.content
+    entry = {
+        "etag": etag or "",
+        "last_modified": last_modified or "",
+        "body_sha256": hashlib.sha256(body).hexdigest(),
+    }
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _atomic_write(_cache_body_path(url), gzip.compress(body))
+        with _cache_lock:
+            index = _load_cache_index()
+            index[url] = entry
+            _atomic_write(CACHE_INDEX_PATH, json.dumps(index, indent=2).encode("utf-8"))
+    except OSError as e:
+        logger.warning("写入缓存失败: %s - %s", url, e)
+
+
 # ==================== 工具函数 ====================
 def fetch_url_with_retry(
     url: str, timeout: int = REQUEST_TIMEOUT, retries: int = RETRY_TIMES
-) -> Tuple[Optional[str], str]:
+) -> Tuple[Optional[bytes], str]:
     """
-    获取 URL 内容，支持重试机制
+    获取 URL 内容（原始字节），支持重试机制和条件请求缓存
 
     Args:
         url: 目标 URL
@@ -67,272 +254,595 @@ def fetch_url_with_retry(
         retries: 重试次数
 
     Returns:
-        Tuple[内容, 状态信息]
+        Tuple[内容, 状态信息]，命中缓存（HTTP 304）时状态为 "cached"
     """
+    entry, cached_body = get_cached_response(url)
+    headers = {}
+    if entry:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
     for attempt in range(retries):
         try:
-            response = requests.get(url, timeout=timeout)
+            response = SESSION.get(url, timeout=timeout, headers=headers)
+            if response.status_code == 304 and cached_body is not None:
+                logger.info("内容未变化，使用缓存: %s", url)
+                return cached_body, "cached"
+            if response.status_code in RETRY_STATUS_CODES and attempt < retries - 1:
+                delay = _backoff_delay(attempt, response, max_wait=timeout)
+                logger.warning(
+                    "HTTP %d: %s (尝试 %d/%d), 等待 %.1fs",
+                    response.status_code,
+                    url,
+                    attempt + 1,
+                    retries,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
             response.raise_for_status()
-            logger.info(f"成功获取链接: {url}")
-            return response.text, "success"
+            # requests 默认发送 Accept-Encoding: gzip, deflate，raw.tell() 为实际传输字节数
+            logger.info(
+                "成功获取链接: %s (%d 字节, 传输 %d 字节)",
+                url,
+                len(response.content),
+                response.raw.tell(),
+            )
+            store_cached_response(url, response)
+            return response.content, "success"
 
         except requests.exceptions.Timeout:
-            delay = RETRY_DELAY * (2**attempt)
-            logger.warning(
-                f"请求超时: {url} (尝试 {attempt + 1}/{retries}), 等待 {delay}s"
-            )
+            logger.warning("请求超时: %s (尝试 %d/%d)", url, attempt + 1, retries)
             if attempt < retries - 1:
-                time.sleep(delay)
+                time.sleep(_backoff_delay(attempt, max_wait=timeout))
 
         except requests.exceptions.ConnectionError:
-            delay = RETRY_DELAY * (2**attempt)
-            logger.warning(
-                f"连接错误: {url} (尝试 {attempt + 1}/{retries}), 等待 {delay}s"
-            )
+            logger.warning("连接错误: %s (尝试 %d/%d)", url, attempt + 1, retries)
             if attempt < retries - 1:
-                time.sleep(delay)
+                time.sleep(_backoff_delay(attempt, max_wait=timeout))
 
         except requests.exceptions.HTTPError as e:
-            status_code = e.response.status_code if e.response else "unknown"
-            logger.error(f"HTTP 错误 {status_code}: {url}")
+            status_code = (
+                e.response.status_code if e.response is not None else "unknown"
+            )
+            logger.error("HTTP 错误 %s: %s", status_code, url)
             return None, f"HTTP {status_code}"
 
         except Exception as e:
-            logger.error(f"获取链接失败: {url} - {str(e)}")
+            logger.error("获取链接失败: %s - %s", url, e)
             return None, str(e)
 
     return None, "最大重试次数达到"
 
 
-def process_trackers(content: str) -> Set[str]:
+def process_trackers(content: bytes) -> Set[bytes]:
     """
-    处理 trackers 内容：去重、去除空行
+    处理 trackers 内容：去重、去除空行，丢弃不是合法 UTF-8 的行
 
     Args:
-        raw_content: 原始内容
+        content: 原始内容（字节）
 
     Returns:
-        处理后的 tracker 集合
+        处理后的 tracker 集合（bytes 对象比 str 更小，去重时哈希表更紧凑），
+        其中每一项都可以直接 decode()，提交内容与 blob SHA 来自同一份字节
     """
-    lines = content.splitlines()
-    # 去除空行和空白字符
-    cleaned_lines = [line.strip() for line in lines if line.strip()]
-    return set(cleaned_lines)
+    # 整个遍历在 C 层完成：strip 同时去掉 \r，filter(None, ...) 丢弃空行
+    trackers = set(filter(None, map(bytes.strip, content.split(b"\n"))))
+    try:
+        content.decode("utf-8")
+    except UnicodeDecodeError:
+        # 少见情况：整体解码失败时才逐行检查
+        invalid = {t for t in trackers if not _is_utf8(t)}
+        logger.warning("丢弃 %d 行非 UTF-8 内容", len(invalid))
+        trackers -= invalid
+    return trackers
 
 
-def get_github_file_sha(file_path: str, headers: Dict[str, str]) -> Optional[str]:
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{file_path}"
-    for attempt in range(RETRY_TIMES):
-        try:
-            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-
-            if "X-RateLimit-Remaining" in response.headers:
-                remaining = int(response.headers["X-RateLimit-Remaining"])
-                reset = int(response.headers.get("X-RateLimit-Reset", 0))
-                if remaining <= 1 and reset:
-                    sleep_time = max(reset - int(time.time()), 1)
-                    logger.warning(f"API 限流即将触发，等待 {sleep_time}s")
-                    time.sleep(sleep_time)
-                    continue
+def _is_utf8(data: bytes) -> bool:
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
 
-            if response.status_code == 200:
-                return response.json()["sha"]
-            elif response.status_code == 404:
-                logger.warning(f"文件不存在: {file_path}")
-                return None
-            elif response.status_code == 403:
-                if "X-RateLimit-Remaining" in response.headers:
-                    reset = int(response.headers.get("X-RateLimit-Reset", 0))
-                    sleep_time = max(reset - int(time.time()), 1)
-                    logger.warning(f"触发限��，等待 {sleep_time}s")
-                    time.sleep(sleep_time)
-                    continue
-                logger.error(f"权限不足: {file_path}")
-                return None
-            else:
-                logger.error(f"获取 SHA 失败: {response.status_code}")
-                return None
-        except requests.exceptions.RequestException as e:
-            delay = RETRY_DELAY * (2**attempt)
+
+def canonical_tracker(tracker: bytes) -> bytes:
+    """去重用的规范形式：scheme 与主机名（含端口）小写，去掉末尾的 /"""
+    scheme, sep, rest = tracker.partition(b"://")
+    if not sep:
+        return tracker.rstrip(b"/")
+    host, slash, path = rest.partition(b"/")
+    return (scheme.lower() + sep + host.lower() + slash + path).rstrip(b"/")
+
+
+def dedupe_trackers(trackers: Set[bytes]) -> List[bytes]:
+    """
+    按规范形式合并仅大小写或末尾 / 不同的 tracker
+
+    Args:
+        trackers: 已按原文去重的 tracker 集合
+
+    Returns:
+        排序后的 tracker 列表；同一规范形式保留原文，优先取与规范形式相同的写法，
+        否则取字典序最小的，结果与数据源完成顺序无关
+    """
+    best: Dict[bytes, bytes] = {}
+    for tracker in sorted(trackers):
+        key = canonical_tracker(tracker)
+        if key not in best or tracker == key:
+            best[key] = tracker
+    return sorted(best.values())
+
+
+def _backoff_delay(
+    attempt: int,
+    response: Optional[requests.Response] = None,
+    max_wait: float = RATE_LIMIT_MAX_WAIT,
+) -> float:
+    """
+    计算第 attempt 次重试前的等待时间
+
+    优先使用响应中的 Retry-After，其次是主限流耗尽时的 X-RateLimit-Reset，
+    否则按指数退避乘以 0.5~1.5 的随机抖动，避免并发请求在同一时刻重试。
+
+    Args:
+        attempt: 已失败的次数（从 0 开始）
+        response: 触发重试的响应（网络错误时为 None）
+        max_wait: 等待上限；GitHub API 使用 RATE_LIMIT_MAX_WAIT，数据源使用请求超时，
+            避免单个不稳定的镜像拖住整个获取阶段
+
+    Returns:
+        等待秒数，限制在 [1, max_wait] 内
+    """
+    wait = None
+    if response is not None:
+        headers = response.headers
+        retry_after = headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                pass
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            wait = int(headers.get("X-RateLimit-Reset", 0)) - time.time()
+    if wait is None:
+        wait = RETRY_DELAY * (2**attempt) * random.uniform(0.5, 1.5)
+    return min(max(wait, 1), max_wait)
+
+
+def _retry_wait(response: requests.Response, attempt: int) -> Optional[float]:
+    """
+    判断 GitHub API 响应是否需要重试，并给出等待时间
+
+    Returns:
+        等待秒数；无需重试（包括普通 403 权限错误）时返回 None
+    """
+    status = response.status_code
+    if status == 403:
+        headers = response.headers
+        if not (
+            "Retry-After" in headers
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in response.text.lower()
+        ):
+            # 普通 403：权限问题，不重试
+            return None
+    elif status not in RETRY_STATUS_CODES:
+        return None
+    return _backoff_delay(attempt, response)
+
+
+def github_api_request(method: str, path: str, **kwargs) -> Optional[requests.Response]:
+    """
+    调用仓库级 GitHub API，处理限流、5xx 和网络错误的重试
+
+    Args:
+        method: HTTP 方法
+        path: 仓库下的 API 路径，如 "/git/refs/heads/main"
+        **kwargs: 透传给 requests 的参数（如 json）
+
+    Returns:
+        响应对象（状态码由调用方判断），网络重试耗尽时返回 None
+    """
+    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}{path}"
+    for attempt in range(GITHUB_RETRY_TIMES):
+        try:
+            response = GITHUB_SESSION.request(
+                method, url, timeout=REQUEST_TIMEOUT, **kwargs
+            )
+        except requests.exceptions.RequestException:
             logger.warning(
-                f"请求失败: {url} (尝试 {attempt + 1}/{RETRY_TIMES}), 等待 {delay}s"
+                "请求失败: %s %s (尝试 %d/%d)",
+                method,
+                url,
+                attempt + 1,
+                GITHUB_RETRY_TIMES,
             )
-            if attempt < RETRY_TIMES - 1:
-                time.sleep(delay)
-        except Exception as e:
-            logger.error(f"获取 SHA 错误: {e}")
-            return None
+            if attempt < GITHUB_RETRY_TIMES - 1:
+                time.sleep(_backoff_delay(attempt))
+            continue
+
+        wait = _retry_wait(response, attempt)
+        if wait is not None:
+            if attempt == GITHUB_RETRY_TIMES - 1:
+                return response
+            logger.warning(
+                "可重试响应 %d: %s %s (尝试 %d/%d), 等待 %.0fs",
+                response.status_code,
+                method,
+                url,
+                attempt + 1,
+                GITHUB_RETRY_TIMES,
+                wait,
+            )
+            time.sleep(wait)
+            continue
+
+        # 响应头是大小写不敏感的字典，每个键只查一次；配额充足时不必读取 Reset
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and int(remaining) <= 1:
+            reset = int(response.headers.get("X-RateLimit-Reset", 0))
+            if reset:
+                # 本次请求已成功，等待配额重置后再返回，避免下一次调用被拒
+                sleep_time = min(max(reset - int(time.time()), 1), RATE_LIMIT_MAX_WAIT)
+                logger.warning("API 限流即将触发，等待 %ds", sleep_time)
+                time.sleep(sleep_time)
+
+        return response
     return None
 
 
-def get_github_file_content(
-    file_path: str, headers: Dict[str, str]
-) -> Tuple[Optional[str], Optional[str]]:
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{file_path}"
+def _api_failed(action: str, response: Optional[requests.Response]) -> str:
+    """记录 API 调用失败并返回状态信息"""
+    if response is None:
+        logger.error("%s失败: 最大重试次数达到", action)
+        return "max_retries"
+    logger.error("%s失败: %d", action, response.status_code)
+    logger.error(response.text)
+    return f"http_{response.status_code}"
+
+
+def git_blob_sha1(data: bytes) -> str:
+    """计算与 git / GitHub 一致的 blob SHA-1"""
+    return hashlib.sha1(b"blob %d\0%s" % (len(data), data)).hexdigest()
+
+
+def _last_sha_key(path: str) -> str:
+    """提交缓存的键包含目标仓库和分支，切换 REPO_OWNER / REPO_NAME 时不会误用旧记录"""
+    return f"{REPO_OWNER}/{REPO_NAME}@{BRANCH_NAME}:{path}"
+
+
+def _load_last_shas() -> Dict[str, str]:
     try:
-        response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            return base64.b64decode(data["content"]).decode(), data["sha"]
-        return None, None
-    except Exception as e:
-        logger.error(f"获取文件内容错误: {e}")
-        return None, None
+        with open(LAST_SHAS_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 
-def has_content_changed(
-    new_content: str, file_path: str, headers: Dict[str, str]
-) -> Tuple[bool, Optional[str]]:
-    existing_content, sha = get_github_file_content(file_path, headers)
-    if existing_content is None:
-        return True, sha
-    return existing_content.strip() != new_content.strip(), sha
-
-
-def update_github_file(
-    file_path: str,
-    content: str,
-    message: str,
-    headers: Dict[str, str],
-    skip_if_unchanged: bool = True,
-) -> Tuple[bool, str]:
-    if skip_if_unchanged:
-        changed, existing_sha = has_content_changed(
-            base64.b64decode(content).decode(), file_path, headers
-        )
-        if not changed:
-            logger.info(f"内容无变化，跳过更新: {file_path}")
-            return True, "skipped"
-        sha = existing_sha
-    else:
-        sha = get_github_file_sha(file_path, headers)
+def _save_last_shas(shas: Dict[str, str]):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _atomic_write(LAST_SHAS_PATH, json.dumps(shas, indent=2).encode("utf-8"))
+    except OSError as e:
+        logger.warning("写入提交缓存失败: %s", e)
 
-    if sha is None and file_path != TRACKERS_FILE_PATH:
-        logger.warning(f"无法获取 {file_path} 的 SHA")
-        return False, "no_sha"
 
-    data = {"message": message, "content": content}
-    if sha:
-        data["sha"] = sha
+def commit_files(files: Dict[str, bytes], message: str) -> Tuple[bool, str]:
+    """
+    通过 Git Data API 将多个文件合并为一次提交
 
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{file_path}"
-    for attempt in range(RETRY_TIMES):
-        try:
-            response = requests.put(
-                url, headers=headers, json=data, timeout=REQUEST_TIMEOUT
-            )
+    先用本地记录的上次提交 blob SHA 过滤掉未变化的文件，全部未变化时不发起
+    任何请求。其余新内容直接内联在 tree 中由 GitHub 生成 blob；新 tree 与
+    父提交的 tree 相同时说明内容无变化，跳过提交。
 
-            if "X-RateLimit-Remaining" in response.headers:
-                remaining = int(response.headers["X-RateLimit-Remaining"])
-                reset = int(response.headers.get("X-RateLimit-Reset", 0))
-                if remaining <= 1 and reset:
-                    sleep_time = max(reset - int(time.time()), 1)
-                    logger.warning(f"API 限流即将触发，等待 {sleep_time}s")
-                    time.sleep(sleep_time)
-                    continue
+    Args:
+        files: 文件路径 -> 新内容（UTF-8 字节，只有需要提交的文件才解码写入 JSON 请求体）
+        message: 提交信息
 
-            if response.status_code == 200:
-                logger.info(f"成功更新文件: {file_path}")
-                return True, "updated"
-            elif response.status_code == 403:
-                if "X-RateLimit-Remaining" in response.headers:
-                    reset = int(response.headers.get("X-RateLimit-Reset", 0))
-                    sleep_time = max(reset - int(time.time()), 1)
-                    logger.warning(f"触发限流，等待 {sleep_time}s")
-                    time.sleep(sleep_time)
-                    continue
-                logger.error(f"权限不足: {file_path}")
-                return False, "forbidden"
-            else:
-                logger.error(f"更新文件失败 {file_path}: {response.status_code}")
-                logger.error(response.text)
-                return False, f"http_{response.status_code}"
-        except requests.exceptions.RequestException as e:
-            delay = RETRY_DELAY * (2**attempt)
-            logger.warning(
-                f"更新失败: {file_path} (尝试 {attempt + 1}/{RETRY_TIMES}), 等待 {delay}s"
-            )
-            if attempt < RETRY_TIMES - 1:
-                time.sleep(delay)
-        except Exception as e:
-            logger.error(f"更新文件异常: {e}")
-            return False, str(e)
-    return False, "max_retries"
+    Returns:
+        Tuple[是否成功, 状态]，状态为 "updated"、"skipped" 或错误信息
+    """
+    keys = {path: _last_sha_key(path) for path in files}
+    shas = {keys[path]: git_blob_sha1(content) for path, content in files.items()}
+    last_shas = _load_last_shas()
+    changed = {
+        path: content
+        for path, content in files.items()
+        if last_shas.get(keys[path]) != shas[keys[path]]
+    }
+    if not changed:
+        logger.info("内容与上次提交一致，跳过提交: %s", ", ".join(files))
+        return True, "skipped"
+
+    # branches 接口一次返回分支头提交及其 tree，省去单独查询父提交
+    response = github_api_request("GET", f"/branches/{BRANCH_NAME}")
+    if response is None or response.status_code != 200:
+        return False, _api_failed("获取分支信息", response)
+    head = response.json()["commit"]
+    parent_sha = head["sha"]
+    base_tree = head["commit"]["tree"]["sha"]
+
+    tree = [
+        {"path": path, "mode": "100644", "type": "blob", "content": content.decode()}
+        for path, content in changed.items()
+    ]
+    response = github_api_request(
+        "POST", "/git/trees", json={"base_tree": base_tree, "tree": tree}
+    )
+    if response is None or response.status_code != 201:
+        return False, _api_failed("创建 tree", response)
+    new_tree = response.json()["sha"]
+    if new_tree == base_tree:
+        logger.info("内容无变化，跳过提交: %s", ", ".join(changed))
+        _save_last_shas({**last_shas, **shas})
+        return True, "skipped"
+
+    response = github_api_request(
+        "POST",
+        "/git/commits",
+        json={"message": message, "tree": new_tree, "parents": [parent_sha]},
+    )
+    if response is None or response.status_code != 201:
+        return False, _api_failed("创建提交", response)
+    commit_sha = response.json()["sha"]
+
+    response = github_api_request(
+        "PATCH", f"/git/refs/heads/{BRANCH_NAME}", json={"sha": commit_sha}
+    )
+    if response is None or response.status_code != 200:
+        return False, _api_failed("更新分支引用", response)
+
+    logger.info("成功提交文件: %s (%s)", ", ".join(changed), commit_sha[:7])
+    _save_last_shas({**last_shas, **shas})
+    return True, "updated"
 
 
 # ==================== Tracker 健康检测模块 ====================
+import selectors
 import socket
 import struct
+from urllib.parse import urlsplit
 
-UDP_CONNECT_REQUEST = struct.pack("!QII", 0x41727101980, 0, 0x12345678)
-HEALTH_CHECK_TIMEOUT = 5
+UDP_PROTOCOL_ID = 0x41727101980  # BEP 15 connect 请求的固定 protocol id
+HEALTH_CHECK_TIMEOUT = 3.0  # 秒，UDP 响应通常远小于该值
 BEST_TRACKERS_COUNT = 4
+UDP_CHECK_WORKERS = 128  # UDP 检测前 DNS 解析的并发数
+UDP_DRAIN_INTERVAL = 32  # UDP 批量发送时每发出多少个请求收取一次已到达的响应
+UDP_RECV_BUFFER = 1 << 20  # UDP 接收缓冲区（字节），实际上限受内核 rmem_max 限制
+HTTP_CHECK_WORKERS = 32  # HTTP 检测复用 SESSION 连接池
 
 
 def check_http_tracker(
-    tracker: str, timeout: int = HEALTH_CHECK_TIMEOUT
+    tracker: str, timeout: float = HEALTH_CHECK_TIMEOUT
 ) -> Tuple[bool, float]:
     if not (tracker.startswith("http://") or tracker.startswith("https://")):
         return False, 0.0
-    url = tracker.rstrip("/") + "/announce"
+    headers = {"User-Agent": "BitTorrent/2.0"}
     try:
         start = time.perf_counter()
-        resp = requests.get(
-            url, timeout=timeout, headers={"User-Agent": "BitTorrent/2.0"}
+        # 只取响应头：不带参数的 announce 通常返回错误页，无需下载；不支持 HEAD 时退回 GET 并丢弃响应体
+        resp = SESSION.head(
+            tracker, timeout=timeout, allow_redirects=False, headers=headers
         )
+        if resp.status_code in (405, 501):
+            resp = SESSION.get(
+                tracker,
+                timeout=timeout,
+                allow_redirects=False,
+                headers=headers,
+                stream=True,
+            )
+            resp.close()
         elapsed = time.perf_counter() - start
-        return 200 <= resp.status_code < 300, elapsed
+        # 空 announce 返回 4xx 同样说明 tracker 在线，只有 5xx 视为不可用
+        return resp.status_code < 500, elapsed
     except Exception:
         return False, timeout
 
 
-def check_udp_tracker(
-    tracker: str, timeout: int = HEALTH_CHECK_TIMEOUT
-) -> Tuple[bool, float]:
-    if not tracker.startswith("udp://"):
-        return False, 0.0
+def _parse_udp_tracker(tracker: str) -> Optional[Tuple[str, int]]:
+    """解析 udp://host:port[/announce] 为 (主机名, 端口)，格式不合法返回 None"""
     try:
-        parts = tracker[6:].split(":")
-        if len(parts) != 2:
-            return False, 0.0
-        host, port = parts[0], int(parts[1])
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
-        start = time.perf_counter()
-        sock.sendto(UDP_CONNECT_REQUEST, (host, port))
-        data, _ = sock.recvfrom(16)
-        elapsed = time.perf_counter() - start
+        parsed = urlsplit(tracker)
+        host, port = parsed.hostname, parsed.port
+    except ValueError:
+        return None
+    if not host or not port:
+        return None
+    return host, port
+
+
+def _resolve_host(host: str) -> Optional[str]:
+    """解析主机名为 IPv4 地址，失败返回 None"""
+    try:
+        return socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_DGRAM)[0][4][
+            0
+        ]
+    except OSError:
+        return None
+
+
+def _drain_udp_replies(
+    sock: socket.socket,
+    pending: Dict[int, Tuple[str, float]],
+    results: Dict[str, Tuple[bool, float]],
+):
+    """读完 socket 中已到达的响应，按 txid 标记对应 tracker 存活"""
+    while pending:
+        try:
+            data, _ = sock.recvfrom(16)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            continue
+        if len(data) < 8:
+            continue
+        entry = pending.pop(struct.unpack_from("!I", data, 4)[0], None)
+        if entry is not None:
+            tracker, sent_at = entry
+            results[tracker] = (True, time.perf_counter() - sent_at)
+
+
+def _wait_writable(
+    sel: selectors.BaseSelector,
+    sock: socket.socket,
+    pending: Dict[int, Tuple[str, float]],
+    results: Dict[str, Tuple[bool, float]],
+    timeout: float,
+) -> bool:
+    """发送缓冲区满时等待 socket 可写，等待期间照常收取响应；超时返回 False"""
+    sel.modify(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+    try:
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            writable = False
+            for _, mask in sel.select(timeout=remaining):
+                if mask & selectors.EVENT_READ:
+                    _drain_udp_replies(sock, pending, results)
+                if mask & selectors.EVENT_WRITE:
+                    writable = True
+            if writable:
+                return True
+    finally:
+        sel.modify(sock, selectors.EVENT_READ)
+
+
+def udp_probe_batch(
+    trackers: List[str], timeout: float = HEALTH_CHECK_TIMEOUT
+) -> Dict[str, Tuple[bool, float]]:
+    """
+    用单个非阻塞 UDP socket 批量探测 tracker
+
+    先对去重后的主机名并发做一次 DNS 解析，再连续发出全部 connect 请求，
+    最后在 selector 循环中收取响应，按 transaction id 对应回 tracker。
+    发送缓冲区写满（EAGAIN）时先等待可写并收取已到达的响应，再重发同一个请求；
+    发送期间也定期收取响应，避免接收缓冲区溢出。
+
+    Args:
+        trackers: udp:// tracker 列表
+        timeout: 最后一个请求发出后等待响应的秒数
+
+    Returns:
+        tracker -> (是否存活, 延迟)，未响应的延迟记为 timeout
+    """
+    results = {t: (False, timeout) for t in trackers}
+    if not trackers:
+        return results
+
+    # 同一主机常以多个端口出现，每个主机只解析一次；DNS 解析是阻塞调用，放到线程池里并发完成
+    targets = [_parse_udp_tracker(t) for t in trackers]
+    hosts = list({target[0] for target in targets if target})
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(UDP_CHECK_WORKERS, len(hosts)))
+    ) as pool:
+        resolved = dict(zip(hosts, pool.map(_resolve_host, hosts)))
+
+    pending: Dict[int, Tuple[str, float]] = {}  # txid -> (tracker, 发送时间)
+    # connect 请求只有末尾 4 字节的 txid 因 tracker 而异，整批复用同一个缓冲区
+    packet = bytearray(16)
+    struct.pack_into("!QI", packet, 0, UDP_PROTOCOL_ID, 0)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UDP_RECV_BUFFER)
+    except OSError:
+        pass
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    sent = failed_sends = 0
+    stalled = False  # 某个请求等待可写超时后，后续 EAGAIN 直接记为失败，不再逐个等待
+    try:
+        for tracker, target in zip(trackers, targets):
+            ip = resolved.get(target[0]) if target else None
+            if ip is None:
+                results[tracker] = (False, 0.0)
+                continue
+            txid = random.getrandbits(32)
+            while txid in pending:
+                txid = random.getrandbits(32)
+            struct.pack_into("!I", packet, 12, txid)
+            send_deadline = time.perf_counter() + timeout
+            while True:
+                try:
+                    sock.sendto(packet, (ip, target[1]))
+                except BlockingIOError:
+                    remaining = send_deadline - time.perf_counter()
+                    if not stalled and _wait_writable(
+                        sel, sock, pending, results, remaining
+                    ):
+                        continue
+                    stalled = True
+                    failed_sends += 1
+                except OSError:
+                    failed_sends += 1
+                else:
+                    pending[txid] = (tracker, time.perf_counter())
+                    sent += 1
+                    # 发送期间定期收取响应，避免大批量时接收缓冲区写满丢包
+                    if sent % UDP_DRAIN_INTERVAL == 0:
+                        _drain_udp_replies(sock, pending, results)
+                break
+        if failed_sends:
+            logger.warning("UDP 检测有 %d 个请求发送失败", failed_sends)
+
+        deadline = time.perf_counter() + timeout
+        while pending:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not sel.select(timeout=remaining):
+                break
+            # 一次唤醒尽量把已到达的响应全部读完
+            _drain_udp_replies(sock, pending, results)
+    finally:
+        sel.close()
         sock.close()
-        if len(data) >= 8:
-            return True, elapsed
-        return False, elapsed
-    except Exception:
-        return False, timeout
+    return results
+
+
+def _health_result(tracker: str, alive: bool, delay: float) -> Dict:
+    score = float(alive) * max(0, 1 - delay / 5.0)
+    return {"tracker": tracker, "alive": alive, "delay": delay, "score": score}
 
 
 def check_tracker_health(tracker: str) -> Dict:
     if tracker.startswith("udp://"):
-        alive, delay = check_udp_tracker(tracker)
+        alive, delay = udp_probe_batch([tracker])[tracker]
     elif tracker.startswith("http"):
         alive, delay = check_http_tracker(tracker)
     else:
         return {"tracker": tracker, "alive": False, "delay": 0.0, "score": 0.0}
-    score = float(alive) * max(0, 1 - delay / 5.0)
-    return {"tracker": tracker, "alive": alive, "delay": delay, "score": score}
+    return _health_result(tracker, alive, delay)
 
 
 def filter_best_trackers(
     trackers: List[str], top_n: int = BEST_TRACKERS_COUNT
 ) -> List[str]:
-    logger.info(f"开始检测 {len(trackers)} 个 tracker 健康状态...")
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = [executor.submit(check_tracker_health, t) for t in trackers]
-        results = [f.result() for f in as_completed(futures)]
-
-    best = sorted(
-        [r for r in results if r["score"] > 0.5], key=lambda x: x["score"], reverse=True
-    )[:top_n]
-    logger.info(f"筛选出 {len(best)} 个最佳 trackers")
+    logger.info("开始检测 %d 个 tracker 健康状态...", len(trackers))
+    # HTTP 在线程池中检测，同时主线程用单个 socket 批量探测 UDP
+    udp_list = [t for t in trackers if t.startswith("udp://")]
+    other_list = [t for t in trackers if not t.startswith("udp://")]
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(HTTP_CHECK_WORKERS, len(other_list)))
+    ) as http_pool:
+        other_results = http_pool.map(check_tracker_health, other_list)
+        udp_results = [
+            _health_result(t, alive, delay)
+            for t, (alive, delay) in udp_probe_batch(udp_list).items()
+        ]
+        results = udp_results + list(other_results)
+
+    # 只需要前 top_n 个：堆选择代替整表排序，结果与 sorted(...)[:top_n] 一致
+    best = heapq.nlargest(
+        top_n,
+        (r for r in results if r["score"] > 0.5),
+        key=operator.itemgetter("score"),
+    )
+    logger.info("筛选出 %d 个最佳 trackers", len(best))
 
     if best:
         print("\n" + "=" * 70)
@@ -353,43 +863,107 @@ def filter_best_trackers(
 
 
 # ==================== 主逻辑 ====================
-def fetch_all_trackers_concurrent(urls: List[str]) -> Tuple[Set[str], Dict]:
+def fetch_all_trackers_concurrent(
+    urls: List[str], readme_url: Optional[str] = None
+) -> Tuple[List[bytes], Dict, Optional[bytes]]:
     """
     并发获取所有 trackers
 
     Args:
         urls: URL 列表
+        readme_url: README 地址，与数据源一起并发获取（可选）
 
     Returns:
-        去重后的 tracker 集合
+        Tuple[去重并排序后的 tracker 列表, 各数据源获取结果, README 内容]
     """
     all_trackers = set()
     results = {}
+    readme_content = None
 
-    logger.info(f"开始并发获取 {len(urls)} 个数据源...")
+    logger.info("开始并发获取 %d 个数据源...", len(urls))
 
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    # 纯 I/O 任务：每个 URL 一个线程，所有请求同时在途，总耗时取决于最慢的 URL
+    url_count = len(urls) + (1 if readme_url else 0)
+    workers = max(1, min(FETCH_MAX_WORKERS, url_count))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    stopped_early = False
+    try:
         future_to_url = {
             executor.submit(fetch_url_with_retry, url): url for url in urls
         }
+        if readme_url:
+            future_to_url[executor.submit(fetch_url_with_retry, readme_url)] = (
+                readme_url
+            )
 
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
-            try:
-                content, status = future.result()
-                if content:
-                    processed = process_trackers(content)
-                    all_trackers.update(processed)
-                    results[url] = {"status": "success", "count": len(processed)}
-                    logger.info(f"✓ {url} - 获取到 {len(processed)} 个 trackers")
-                else:
-                    results[url] = {"status": "failed", "error": status}
-                    print(f"{Fore.RED}✗ 获取失败: {url} - {status}{Fore.RESET}")
-            except Exception as e:
-                results[url] = {"status": "error", "error": str(e)}
-                print(f"{Fore.RED}✗ 异常: {url} - {e}{Fore.RESET}")
+        succeeded = 0
+        readme_done = readme_url is None
+        pending = set(future_to_url)
+        # 软截止时间：到点时即使没有新完成的请求也要醒来检查一次
+        soft_deadline = (
+            time.perf_counter() + FETCH_SOFT_DEADLINE if FETCH_SOFT_DEADLINE else None
+        )
+        overdue = False
+        while pending:
+            timeout = None
+            if soft_deadline is not None:
+                timeout = max(0.0, soft_deadline - time.perf_counter())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = future_to_url[future]
+                if url == readme_url:
+                    readme_content = future.result()[0]
+                    readme_done = True
+                    continue
+                try:
+                    content, status = future.result()
+                    if content:
+                        processed = process_trackers(content)
+                        all_trackers.update(processed)
+                        succeeded += 1
+                        results[url] = {"status": status, "count": len(processed)}
+                        logger.info("✓ %s - 获取到 %d 个 trackers", url, len(processed))
+                    else:
+                        results[url] = {"status": "failed", "error": status}
+                        print(f"{Fore.RED}✗ 获取失败: {url} - {status}{Fore.RESET}")
+                except Exception as e:
+                    results[url] = {"status": "error", "error": str(e)}
+                    print(f"{Fore.RED}✗ 异常: {url} - {e}{Fore.RESET}")
+
+            if soft_deadline is not None and time.perf_counter() >= soft_deadline:
+                # 超时后不再定时唤醒，之后每完成一个请求检查一次
+                overdue = True
+                soft_deadline = None
+
+            # 提前停止：已有足够 trackers 时不再等待最慢的数据源（README 仍需获取）
+            if readme_done and (
+                (
+                    EARLY_STOP_TRACKERS
+                    and succeeded >= EARLY_STOP_MIN_SOURCES
+                    and len(all_trackers) >= EARLY_STOP_TRACKERS
+                )
+                or (overdue and len(all_trackers) >= MIN_TRACKERS * 2)
+            ):
+                stopped_early = True
+                break
+    finally:
+        # 提前停止时取消未开始的请求，不阻塞等待进行中的请求
+        executor.shutdown(wait=not stopped_early, cancel_futures=True)
+
+    if stopped_early:
+        skipped = [url for url in urls if url not in results]
+        for url in skipped:
+            results[url] = {"status": "cancelled"}
+        logger.info(
+            "已获取 %d 个 trackers，提前停止，跳过 %d 个数据源",
+            len(all_trackers),
+            len(skipped),
+        )
 
-    return all_trackers, results
+    trackers = dedupe_trackers(all_trackers)
+    if len(trackers) < len(all_trackers):
+        logger.info("规范化后合并 %d 个重复 tracker", len(all_trackers) - len(trackers))
+    return trackers, results, readme_content
 
 
 def update_readme_content(
@@ -404,25 +978,40 @@ def update_readme_content(
         tracker_count: tracker 数量
 
     Returns:
-        更新后的 README 内容
+        更新后的 README 内容，日期和数量都未变化时与原内容相同
     """
-    # 替换日期
-    date_pattern = r"\[!\[Last update\]\(https://img.shields.io/badge/Last%20update-\d{4}/\d{2}/\d{2}-%232ea043\?style=flat-square&logo=github\)\]\(#\)"
-    updated_content = re.sub(
-        date_pattern,
-        f"[![Last update](https://img.shields.io/badge/Last%20update-{current_date}-%232ea043?style=flat-square&logo=github)](#)",
-        readme_content,
-    )
+    date_badge = f"[![Last update](https://img.shields.io/badge/Last%20update-{current_date}-%232ea043?style=flat-square&logo=github)](#)"
+    count_text = f"All Tracker list &emsp; ({tracker_count} trackers)"
 
-    # 替换 tracker 数量
-    count_pattern = r"All Tracker list &emsp; \(\d+ trackers\)"
-    updated_content = re.sub(
-        count_pattern,
-        f"All Tracker list &emsp; ({tracker_count} trackers)",
-        updated_content,
+    # 一次扫描同时替换日期和 tracker 数量
+    return _README_RE.sub(
+        lambda m: date_badge if m.lastgroup == "date" else count_text, readme_content
     )
 
-    return updated_content
+
+# 结果表格的单元格：颜色码和对齐在模块加载时拼好
+# 每项为 (状态单元格, 数量单元格, 是否有数量)，有数量时数量单元格是 % 模板
+# 状态列宽 4、数量列宽 8（与表头显示宽度一致）；中文占两列，"失败" 右对齐到 6 个字符即显示宽度 8
+_COUNT_CELL = f"{Fore.CYAN}%8d{Fore.RESET}"
+_STATUS_CELLS = {
+    "success": (f"{Fore.GREEN}✓   {Fore.RESET}", _COUNT_CELL, True),
+    "cached": (f"{Fore.CYAN}⊙   {Fore.RESET}", _COUNT_CELL, True),
+    "failed": (
+        f"{Fore.RED}✗   {Fore.RESET}",
+        f"{Fore.RED}{'失败':>6}{Fore.RESET}",
+        False,
+    ),
+    "cancelled": (
+        f"{Fore.YELLOW}-   {Fore.RESET}",
+        f"{Fore.YELLOW}{'跳过':>6}{Fore.RESET}",
+        False,
+    ),
+}
+_UNKNOWN_CELLS = (
+    f"{Fore.YELLOW}!   {Fore.RESET}",
+    f"{Fore.YELLOW}{'未知':>6}{Fore.RESET}",
+    False,
+)
 
 
 def display_results_table(results: Dict, total_count: int, run_time: float):
@@ -438,27 +1027,30 @@ def display_results_table(results: Dict, total_count: int, run_time: float):
     print("获取链接结果：")
     print("=" * 60)
 
-    table_data = []
-    for idx, url in enumerate(URLS):
+    # 表格形状固定，直接按列宽拼接，不依赖 tabulate
+    url_w = max(len(url) for url in URLS)
+    border = f"+----+------+-{'-' * url_w}-+----------+"
+    lines = [
+        border,
+        f"|  # | 状态 | {'URL':<{url_w}} | Trackers |",
+        border.replace("-", "="),
+    ]
+    for idx, url in enumerate(URLS, 1):
         result = results.get(url, {"status": "pending", "count": 0})
         status = result.get("status", "unknown")
         count = result.get("count", 0)
 
-        if status == "success":
-            status_display = f"{Fore.GREEN}✓{Fore.RESET}"
-            count_display = f"{Fore.CYAN}{count}{Fore.RESET}"
-        elif status == "failed":
-            status_display = f"{Fore.RED}✗{Fore.RESET}"
-            count_display = f"{Fore.RED}失败{Fore.RESET}"
-        else:
-            status_display = f"{Fore.YELLOW}!{Fore.RESET}"
-            count_display = f"{Fore.YELLOW}未知{Fore.RESET}"
-
-        table_data.append([idx + 1, status_display, url, count_display])
+        status_display, count_display, has_count = _STATUS_CELLS.get(
+            status, _UNKNOWN_CELLS
+        )
+        if has_count:
+            count_display = count_display % count
 
-    print(
-        tabulate(table_data, headers=["#", "状态", "URL", "Trackers"], tablefmt="grid")
-    )
+        lines.append(
+            f"| {idx:>2} | {status_display} | {url:<{url_w}} | {count_display} |"
+        )
+        lines.append(border)
+    print("\n".join(lines))
 
     print(f"\n{Fore.CYAN}追踪器总数: {total_count}{Fore.RESET}")
     print(f"脚本运行时间: {run_time:.2f} 秒")
@@ -475,17 +1067,14 @@ def main():
     # 获取当前日期
     current_date = datetime.date.today().strftime("%Y/%m/%d")
 
-    # 并发获取所有 trackers
-    all_trackers, results = fetch_all_trackers_concurrent(URLS)
+    # 并发获取所有 trackers（已去重排序），README 在同一批请求中获取
+    readme_url = f"https://raw.githubusercontent.com/{REPO_OWNER}/{REPO_NAME}/{BRANCH_NAME}/{README_FILE_PATH}"
+    trackers_list, results, readme_raw = fetch_all_trackers_concurrent(URLS, readme_url)
 
-    # 转换为列表并排序（可选）
-    trackers_list = sorted(list(all_trackers))
-
-    # 最小数量安全检查：防止提交空文件或异常数据
-    MIN_TRACKERS = 50
+    # 最小数量安全检查：防止提交空文件或异常数据，数量不足时不再进行健康检测
     if len(trackers_list) < MIN_TRACKERS:
         logger.error(
-            f"Trackers 数量过少 ({len(trackers_list)} < {MIN_TRACKERS})，终止提交"
+            "Trackers 数量过少 (%d < %d)，终止提交", len(trackers_list), MIN_TRACKERS
         )
         print(
             f"{Fore.RED}✗ 安全检查失败：Trackers 数量不足，可能存在数据源问题{Fore.RESET}"
@@ -498,78 +1087,50 @@ def main():
     # 输出结果
     display_results_table(results, len(trackers_list), fetch_time - start_time)
 
-    # 健康检测：筛选最佳 trackers
+    # 健康检测：筛选最佳 trackers（检测需要 str，只在这里解码一次）
+    # process_trackers 已丢弃非 UTF-8 行，这里与提交时一样严格解码
     print(f"\n{Fore.YELLOW}正在检测 Tracker 健康状态...{Fore.RESET}")
-    best_trackers = filter_best_trackers(trackers_list, BEST_TRACKERS_COUNT)
-
-    # 准备 GitHub 认证头
-    headers = {
-        "Authorization": f"token {GITHUB_TOKEN}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-
-    # 更新 trackers.txt
-    print(f"\n{Fore.YELLOW}正在更新 trackers.txt...{Fore.RESET}")
-    encoded_content = base64.b64encode("\n".join(trackers_list).encode()).decode()
-    commit_message = f"Update trackers on {current_date} - {len(trackers_list)} items"
-
-    success, status = update_github_file(
-        TRACKERS_FILE_PATH, encoded_content, commit_message, headers
+    best_trackers = filter_best_trackers(
+        [t.decode() for t in trackers_list], BEST_TRACKERS_COUNT
     )
-    if success:
-        if status == "skipped":
-            print(f"{Fore.CYAN}⊙ Trackers 内容无变化，跳过更新{Fore.RESET}")
-        else:
-            print(f"{Fore.GREEN}✓ Trackers 文件更新成功！{Fore.RESET}")
-    else:
-        print(f"{Fore.RED}✗ Trackers 文件更新失败！{Fore.RESET}")
-        sys.exit(1)
 
-    # 更新 trackers_best.txt
+    # 待提交的文件：trackers.txt 必须提交，其余文件可选
+    # 提交内容统一为 bytes：trackers 列表直接拼接，不经过 str；只有确实变化的文件才会在请求体边界解码
+    files = {TRACKERS_FILE_PATH: b"\n".join(trackers_list)}
     if best_trackers:
-        print(f"\n{Fore.YELLOW}正在更新 trackers_best.txt...{Fore.RESET}")
-        encoded_best = base64.b64encode("\n".join(best_trackers).encode()).decode()
-        success, status = update_github_file(
-            "trackers_best.txt",
-            encoded_best,
-            f"Update best trackers on {current_date}",
-            headers,
-        )
-        if success:
-            if status == "skipped":
-                print(f"{Fore.CYAN}⊙ Best trackers 无变化，跳过更新{Fore.RESET}")
-            else:
-                print(f"{Fore.GREEN}✓ Best trackers 更新成功！{Fore.RESET}")
-        else:
-            print(f"{Fore.YELLOW}⚠ Best trackers 更新失败，但不影响主流程{Fore.RESET}")
+        files[BEST_TRACKERS_FILE_PATH] = "\n".join(best_trackers).encode()
 
     # 更新 README.md
-    print(f"\n{Fore.YELLOW}正在更新 README.md...{Fore.RESET}")
+    print(f"\n{Fore.YELLOW}正在生成 README.md...{Fore.RESET}")
     try:
-        readme_url = f"https://raw.githubusercontent.com/{REPO_OWNER}/{REPO_NAME}/main/{README_FILE_PATH}"
-        readme_response = requests.get(readme_url, timeout=REQUEST_TIMEOUT)
-        readme_response.raise_for_status()
-        readme_content = readme_response.text
+        if readme_raw is None:
+            raise RuntimeError(f"获取失败: {readme_url}")
+        readme_content = readme_raw.decode()
 
         updated_readme = update_readme_content(
             readme_content, current_date, len(trackers_list)
         )
-        encoded_readme = base64.b64encode(updated_readme.encode()).decode()
-
-        success, status = update_github_file(
-            README_FILE_PATH, encoded_readme, commit_message, headers
-        )
-        if success:
-            if status == "skipped":
-                print(f"{Fore.CYAN}⊙ README 内容无变化，跳过更新{Fore.RESET}")
-            else:
-                print(f"{Fore.GREEN}✓ README 文件更新成功！{Fore.RESET}")
+        if updated_readme != readme_content:
+            files[README_FILE_PATH] = updated_readme.encode()
         else:
-            print(f"{Fore.RED}✗ README 文件更新失败！{Fore.RESET}")
+            print(f"{Fore.CYAN}⊙ README 内容无变化，跳过更新{Fore.RESET}")
 
     except Exception as e:
-        logger.error(f"README 更新失败: {e}")
-        print(f"{Fore.RED}✗ README 更新异常: {e}{Fore.RESET}")
+        logger.error("README 更新失败: %s", e)
+        print(f"{Fore.RED}✗ README 更新异常，本次不提交 README: {e}{Fore.RESET}")
+
+    # 所有文件合并为一次提交
+    print(f"\n{Fore.YELLOW}正在提交 {', '.join(files)}...{Fore.RESET}")
+    commit_message = f"Update trackers on {current_date} - {len(trackers_list)} items"
+    success, status = commit_files(files, commit_message)
+    if success:
+        if status == "skipped":
+            print(f"{Fore.CYAN}⊙ 文件内容无变化，跳过提交{Fore.RESET}")
+        else:
+            print(f"{Fore.GREEN}✓ 文件提交成功！{Fore.RESET}")
+    else:
+        print(f"{Fore.RED}✗ 文件提交失败！{Fore.RESET}")
+        sys.exit(1)
 
     # 总运行时间
     total_time = time.time() - start_time
@@ -592,5 +1153,5 @@ if __name__ == "__main__":
         print(f"\n{Fore.RED}用户中断执行{Fore.RESET}")
         logger.info("任务被用户中断")
     except Exception as e:
-        logger.error(f"程序异常退出: {e}")
+        logger.error("程序异常退出: %s", e)
         print(f"{Fore.RED}程序异常: {e}{Fore.RESET}")